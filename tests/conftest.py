@@ -1,35 +1,96 @@
 import logging
 import os
 
-import colorlog
 import pytest
 from pages.calculator_page import CalculatorPage
 from playwright.sync_api import sync_playwright
+from utils import event_log
 
+"""Event Log Hooks"""
 
-# Set up the logger with color support
-def setup_logger():
-    handler = colorlog.StreamHandler()
-    handler.setFormatter(colorlog.ColoredFormatter(
-        "%(log_color)s%(asctime)s - %(levelname)s - %(message)s",
-        datefmt='%Y-%m-%d %H:%M:%S',
-        log_colors={
-            'DEBUG': 'cyan',
-            'INFO': 'green',
-            'WARNING': 'yellow',
-            'ERROR': 'red',
-            'CRITICAL': 'bold_red',
-        }
-    ))
 
-    logger = logging.getLogger(__name__)
-    logger.setLevel(logging.INFO)
-    logger.addHandler(handler)
-    return logger
+def _is_controller(config):
+    """True for the xdist controller or a run without xdist."""
+    return not hasattr(config, "workerinput")
 
 
-# Initialize the logger globally
-log = setup_logger()
+def _event_log_dir(config):
+    return os.path.join(str(config.rootpath), config.getoption("--event-log-dir"))
+
+
+def pytest_configure(config):
+    """Start the background event log writer for this process (controller or xdist worker)."""
+    log_dir = _event_log_dir(config)
+    if _is_controller(config):
+        event_log.clear(log_dir)
+    console = config.getoption("--console-log")
+    if console and config.getoption("capture") != "no":
+        # The writer thread would otherwise print into whichever test's capture buffer is active
+        config.issue_config_time_warning(
+            pytest.PytestConfigWarning("--console-log needs output capturing disabled (-s); ignoring it"),
+            stacklevel=2
+        )
+        console = False
+    event_log.start(log_dir, console=console)
+
+
+@pytest.hookimpl(hookwrapper=True, tryfirst=True)
+def pytest_runtest_protocol(item, nextitem):
+    """Stamp every record logged while a test runs with its node id and browser."""
+    # pytest-playwright parametrizes browser_name, so it is known before any fixture runs
+    browser = item.callspec.params.get("browser_name") if hasattr(item, "callspec") else None
+    event_log.set_context(test_id=item.nodeid, browser=browser)
+    yield
+    event_log.set_context(test_id=None, browser=None)
+
+
+def _phase(name):
+    """Stamp records logged during a test phase with its name (setup, call, teardown)."""
+    event_log.set_context(phase=name)
+    yield
+    event_log.set_context(phase=None)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_setup(item):
+    yield from _phase("setup")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    yield from _phase("call")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_teardown(item, nextitem):
+    yield from _phase("teardown")
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Emit one structured event per test phase (setup, call, teardown)."""
+    outcome = yield
+    report = outcome.get_result()
+    event_log.event(
+        f"{report.when} {report.outcome}",
+        level=logging.ERROR if report.failed else logging.INFO,
+        phase=report.when,
+        duration=round(report.duration, 3),
+        outcome=report.outcome,
+    )
+
+
+def pytest_sessionfinish(session):
+    """Flush this process's events; the controller then merges all worker files into one."""
+    event_log.stop()
+    if _is_controller(session.config):
+        event_log.merge(_event_log_dir(session.config))
+
+
+def pytest_unconfigure(config):
+    """Make sure the writer thread is stopped even if the session never finished."""
+    event_log.stop()
+
 
 """Playwright Fixtures"""
 
@@ -50,6 +111,18 @@ def pytest_addoption(parser):
         choices=["chromium", "firefox", "webkit"],
         help="Browser to run tests on: chromium, firefox, or webkit"
     )
+    parser.addoption(
+        "--console-log",
+        action="store_true",
+        default=False,
+        help="Also write colored log output to the terminal (the JSONL event log is always written)"
+    )
+    parser.addoption(
+        "--event-log-dir",
+        action="store",
+        default="reports/logs",
+        help="Directory for the per-worker JSONL event logs and the merged events.jsonl"
+    )
 
 
 @pytest.fixture(scope="function")
@@ -108,7 +181,7 @@ def base_calculator_url():
 @pytest.fixture(scope="function")
 def setup_calculator(request, page, base_calculator_url):
     """Fixture to initialize CalculatorPage, visit the URL, and conditionally clean up afterward."""
-    log.info("Setting up the calculator page.")
+    event_log.log.info("Setting up the calculator page.")
     calculator = CalculatorPage(page)
     calculator.navigate(base_calculator_url)
 
@@ -119,8 +192,8 @@ def setup_calculator(request, page, base_calculator_url):
 
     # Perform cleanup after test unless skip_teardown is True
     if not request.node.skip_teardown:
-        log.info("Tearing down and cleaning the calculator page.")
+        event_log.log.info("Tearing down and cleaning the calculator page.")
         try:
             calculator.clear_all()
         except Exception as e:
-            log.error(f"Failed to clear calculator during teardown: {e}")
+            event_log.log.error(f"Failed to clear calculator during teardown: {e}")
@@ -1,6 +1,6 @@
 import pytest
 from pages.calculator_page import CalculatorPage
-from tests.conftest import log
+from utils.event_log import log
 
 """
 Acceptance Tests For Google Calculator
@@ -0,0 +1,127 @@
+import json
+import logging
+from logging.handlers import QueueHandler
+
+import pytest
+from utils import event_log
+
+"""
+Unit Tests For The Structured Event Log
+"""
+
+
+@pytest.fixture
+def writer(request):
+    """A standalone EventLog with its own logger, so the session's own event log is left untouched."""
+    writer = event_log.EventLog(name=f"event_log_test.{request.node.name}", worker="gw0")
+    yield writer
+    writer.stop()
+
+
+def read_events(path):
+    """Helper function to load a JSONL file into a list of dicts."""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def write_events(path, timestamps):
+    """Helper function to write one event per timestamp, in the given order."""
+    with open(path, "w", encoding="utf-8") as f:
+        for ts in timestamps:
+            f.write(json.dumps({"ts": ts, "message": f"{path.name}-{ts}"}) + "\n")
+
+
+def test_merge_orders_events_across_workers(tmp_path):
+    """Test that per-worker files are merged into a single file ordered by timestamp."""
+    write_events(tmp_path / "events-gw0.jsonl", [1.0, 3.0, 5.0])
+    write_events(tmp_path / "events-gw1.jsonl", [2.0, 4.0])
+
+    merged = event_log.merge(str(tmp_path))
+
+    events = read_events(merged)
+    assert [e["ts"] for e in events] == [1.0, 2.0, 3.0, 4.0, 5.0]
+    assert events[1]["message"] == "events-gw1.jsonl-2.0"
+
+
+def test_merge_returns_none_for_empty_dir(tmp_path):
+    """Test that merging a directory without worker files writes nothing."""
+    assert event_log.merge(str(tmp_path)) is None
+    assert not (tmp_path / "events.jsonl").exists()
+
+
+def test_merge_skips_truncated_lines(tmp_path):
+    """Test that a line left half-written by a crashed worker is skipped instead of failing the merge."""
+    write_events(tmp_path / "events-gw0.jsonl", [1.0, 3.0])
+    write_events(tmp_path / "events-gw1.jsonl", [2.0])
+    with open(tmp_path / "events-gw1.jsonl", "a", encoding="utf-8") as f:
+        f.write('{"ts": 4.0, "level": "INF')
+
+    merged = event_log.merge(str(tmp_path))
+
+    assert [e["ts"] for e in read_events(merged)] == [1.0, 2.0, 3.0]
+    assert not (tmp_path / "events.jsonl.tmp").exists()
+
+
+def test_context_filter_stamps_and_clears():
+    """Test that the current context is stamped onto records and explicit fields win."""
+    context = {"worker": "gw1"}
+    context_filter = event_log.ContextFilter(context)
+
+    context.update(test_id="test_a", browser="firefox", phase="setup")
+    record = logging.makeLogRecord({"msg": "hello", "phase": "call"})
+    context_filter.filter(record)
+    assert (record.test_id, record.worker, record.browser, record.phase) == ("test_a", "gw1", "firefox", "call")
+
+    context.update(test_id=None, browser=None, phase=None)
+    record = logging.makeLogRecord({"msg": "hello"})
+    context_filter.filter(record)
+    assert record.test_id is None
+    assert record.browser is None
+    assert record.phase is None
+
+
+def test_start_is_idempotent(writer, tmp_path):
+    """Test that repeated start() calls leave exactly one queue handler on the logger."""
+    writer.start(str(tmp_path))
+    writer.start(str(tmp_path))
+
+    queue_handlers = [h for h in writer.logger.handlers if isinstance(h, QueueHandler)]
+    assert len(queue_handlers) == 1
+
+
+def test_stop_flushes_worker_file(writer, tmp_path):
+    """Test that stop() drains the queue so every event is in the worker file."""
+    writer.start(str(tmp_path))
+    writer.set_context(test_id="test_b")
+    for i in range(100):
+        writer.event(f"event {i}", phase="call", duration=0.1)
+    writer.stop()
+
+    events = read_events(writer.worker_log_path(str(tmp_path)))
+    assert [e["message"] for e in events] == [f"event {i}" for i in range(100)]
+    assert all(e["test_id"] == "test_b" and e["worker"] == "gw0" and e["phase"] == "call" for e in events)
+
+
+def test_logging_after_stop_is_dropped(writer, tmp_path):
+    """Test that once stopped, log calls neither reach the file nor pile up on the queue."""
+    writer.start(str(tmp_path))
+    writer.event("before stop")
+    writer.stop()
+    writer.event("after stop")
+
+    assert writer.queue.empty()
+    assert [e["message"] for e in read_events(writer.worker_log_path(str(tmp_path)))] == ["before stop"]
+
+
+def test_exception_written_as_separate_field(writer, tmp_path):
+    """Test that a logged traceback goes to exc_info and stays out of the message."""
+    writer.start(str(tmp_path))
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        writer.logger.exception("clear failed")
+    writer.stop()
+
+    events = read_events(writer.worker_log_path(str(tmp_path)))
+    assert events[0]["message"] == "clear failed"
+    assert "ValueError: boom" in events[0]["exc_info"]
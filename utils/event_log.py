@@ -0,0 +1,220 @@
+import copy
+import glob
+import heapq
+import json
+import logging
+import operator
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
+
+"""
+Non-blocking structured event log for the test suite.
+
+Log calls only put records on an in-memory queue; a background QueueListener
+thread serialises them as JSONL into a per-worker file and, optionally, to a
+colored console handler.
+"""
+
+LOGGER_NAME = "calculator"
+EVENT_FIELDS = ("test_id", "worker", "browser", "phase", "duration", "outcome")
+
+
+class ContextFilter(logging.Filter):
+    """Attach the current test context to records that don't set the fields themselves."""
+
+    def __init__(self, context):
+        super().__init__()
+        self.context = context
+
+    def filter(self, record):
+        for field in EVENT_FIELDS:
+            if getattr(record, field, None) is None:
+                setattr(record, field, self.context.get(field))
+        return True
+
+
+class EventQueueHandler(QueueHandler):
+    """QueueHandler that keeps the traceback out of the message so it can be written as its own field."""
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        return record
+
+
+class JsonlFormatter(logging.Formatter):
+    """Format a record as a single JSON line."""
+
+    def format(self, record):
+        event = {
+            "ts": record.created,
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        for field in EVENT_FIELDS:
+            event[field] = getattr(record, field, None)
+        if record.exc_text:
+            event["exc_info"] = record.exc_text
+        return json.dumps(event, default=str)
+
+
+def _console_handler():
+    """Colored console handler; colorlog is optional and only needed when it's enabled."""
+    try:
+        import colorlog
+    except ImportError:
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter(
+            "%(asctime)s - %(levelname)s - [%(worker)s] %(message)s",
+            datefmt='%Y-%m-%d %H:%M:%S'
+        ))
+        return handler
+
+    handler = colorlog.StreamHandler()
+    handler.setFormatter(colorlog.ColoredFormatter(
+        "%(log_color)s%(asctime)s - %(levelname)s - [%(worker)s] %(message)s",
+        datefmt='%Y-%m-%d %H:%M:%S',
+        log_colors={
+            'DEBUG': 'cyan',
+            'INFO': 'green',
+            'WARNING': 'yellow',
+            'ERROR': 'red',
+            'CRITICAL': 'bold_red',
+        }
+    ))
+    return handler
+
+
+class EventLog:
+    """
+    Queue-backed JSONL writer with its own logger, queue and context.
+
+    The queue handler is attached while the writer runs; once stopped, log calls are no-ops.
+    """
+
+    def __init__(self, name=LOGGER_NAME, worker=None):
+        self.logger = logging.getLogger(name)
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        if not self.logger.handlers:
+            # Keeps logging's last-resort stderr handler out of the way while stopped
+            self.logger.addHandler(logging.NullHandler())
+
+        # Per-process context stamped onto every record (current test, browser, phase, ...)
+        self.context = {"worker": worker or os.environ.get("PYTEST_XDIST_WORKER", "master")}
+        self.queue = queue.SimpleQueue()
+        self._handler = EventQueueHandler(self.queue)
+        self._handler.addFilter(ContextFilter(self.context))
+        self._listener = None
+
+    def worker_log_path(self, log_dir):
+        """Path of the JSONL file written by this worker."""
+        return os.path.join(log_dir, f"events-{self.context['worker']}.jsonl")
+
+    def start(self, log_dir, console=False):
+        """
+        Attach the queue handler to the logger and start the background writer.
+
+        Safe to call more than once: the writer is only started the first time.
+        The worker file is appended to; use clear() to drop files from an earlier run.
+
+        :param log_dir: Directory for the per-worker JSONL files
+        :param console: Also write colored output to the terminal
+        """
+        if self._listener is not None:
+            return
+
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = logging.FileHandler(self.worker_log_path(log_dir), mode="a", encoding="utf-8")
+        file_handler.setFormatter(JsonlFormatter())
+        handlers = [file_handler]
+        if console:
+            handlers.append(_console_handler())
+
+        self._listener = QueueListener(self.queue, *handlers, respect_handler_level=True)
+        self._listener.start()
+        self.logger.addHandler(self._handler)
+
+    def stop(self):
+        """Detach the queue handler, drain the queue, stop the background writer and close its files."""
+        if self._listener is None:
+            return
+        self.logger.removeHandler(self._handler)
+        self._listener.stop()
+        for handler in self._listener.handlers:
+            handler.close()
+        self._listener = None
+
+    def set_context(self, **fields):
+        """Update the context stamped onto subsequent records; None values clear a field."""
+        self.context.update(fields)
+
+    def event(self, message, level=logging.INFO, **fields):
+        """Log a structured event, e.g. event("phase finished", phase="call", duration=1.2)."""
+        self.logger.log(level, message, extra=fields)
+
+
+# Default writer used by the test session
+default = EventLog()
+log = default.logger
+start = default.start
+stop = default.stop
+set_context = default.set_context
+event = default.event
+worker_log_path = default.worker_log_path
+
+
+def clear(log_dir):
+    """Remove per-worker files left over from a previous run."""
+    for path in glob.glob(os.path.join(log_dir, "events-*.jsonl")):
+        os.remove(path)
+
+
+def _timestamped(lines):
+    """Yield (ts, line) pairs, skipping blank lines and lines a crashed worker left truncated."""
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            ts = json.loads(line)["ts"]
+        except (ValueError, KeyError, TypeError):
+            continue
+        yield ts, line if line.endswith("\n") else line + "\n"
+
+
+def merge(log_dir, output_name="events.jsonl"):
+    """
+    Merge the per-worker JSONL files into one file ordered by timestamp.
+
+    Lines are copied unchanged; only their "ts" field is parsed, and lines that
+    don't parse are skipped. The merged file is written to a temp file and moved
+    into place, so a failed merge never leaves a half-written file behind.
+
+    :return: Path of the merged file, or None if there was nothing to merge
+    """
+    paths = sorted(glob.glob(os.path.join(log_dir, "events-*.jsonl")))
+    if not paths:
+        return None
+
+    # Each worker file has a single writer, so it is already in time order:
+    # stream the lines through a k-way merge instead of loading the whole run.
+    output_path = os.path.join(log_dir, output_name)
+    tmp_path = output_path + ".tmp"
+    files = [open(path, encoding="utf-8") for path in paths]
+    try:
+        lines = heapq.merge(*[_timestamped(f) for f in files], key=operator.itemgetter(0))
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            out.writelines(line for _, line in lines)
+        os.replace(tmp_path, output_path)
+    finally:
+        for f in files:
+            f.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return output_path